@@ -14,11 +14,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import functools
+import string
 from abc import ABC, abstractmethod
 from snapcraft import formatting_utils
 from snapcraft.internal import steps
 from subprocess import CalledProcessError
-from typing import Dict, List, Union, Optional
+from typing import Any, Dict, List, Tuple, Union, Optional
+
+
+# Bounded, as some errors build their fmt at runtime.
+@functools.lru_cache(maxsize=256)
+def _get_fmt_field_names(fmt: str) -> Tuple[str, ...]:
+    """Return the names of the attributes referenced by the fields in fmt."""
+    field_names = set()
+    for _, field_name, _, _ in string.Formatter().parse(fmt):
+        # Positional fields are not supported, they are fed an empty list.
+        if field_name and not field_name.isdigit():
+            field_names.add(field_name.split(".", 1)[0].split("[", 1)[0])
+    return tuple(field_names)
 
 
 class SnapcraftError(Exception):
@@ -27,11 +41,27 @@ class SnapcraftError(Exception):
     fmt = "Daughter classes should redefine this"
 
     def __init__(self, **kwargs) -> None:
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.__dict__.update(kwargs)
 
     def __str__(self):
-        return self.fmt.format([], **self.__dict__)
+        # Most errors are handled without ever being rendered, so the
+        # message is only built when first requested and then reused.
+        message = self.__dict__.get("_cached_str")
+        if message is None:
+            message = self.fmt.format([], **self._get_fmt_fields())
+            self._cached_str = message
+        return message
+
+    def _get_fmt_fields(self) -> Dict[str, Any]:
+        """Return the fields used to render fmt.
+
+        Only the attributes referenced by fmt are looked up, which allows
+        daughter classes to compute expensive fields lazily as properties.
+        """
+        return {
+            field_name: getattr(self, field_name)
+            for field_name in _get_fmt_field_names(self.fmt)
+        }
 
     def get_exit_code(self):
         """Exit code to use if this exception causes Snapcraft to exit."""
@@ -97,35 +127,47 @@ class StepOutdatedError(SnapcraftError):
     def __init__(
         self, *, step, part, dirty_report=None, outdated_report=None, dependents=None
     ):
+        super().__init__()
+        self.step = step
+        self.part = part
+        self.dirty_report = dirty_report
+        self.outdated_report = outdated_report
+        self.dependents = dependents
+
+    @property
+    def report(self) -> str:
         messages = []
 
-        if dirty_report:
-            messages.append(dirty_report.get_report())
+        if self.dirty_report:
+            messages.append(self.dirty_report.get_report())
 
-        if outdated_report:
-            messages.append(outdated_report.get_report())
+        if self.outdated_report:
+            messages.append(self.outdated_report.get_report())
 
-        if dependents:
-            humanized_dependents = formatting_utils.humanize_list(dependents, "and")
+        if self.dependents:
+            humanized_dependents = formatting_utils.humanize_list(
+                self.dependents, "and"
+            )
             pluralized_dependents = formatting_utils.pluralize(
-                dependents, "depends", "depend"
+                self.dependents, "depends", "depend"
             )
             messages.append(
                 "The {0!r} step for {1!r} needs to be run again, "
                 "but {2} {3} on it.\n".format(
-                    step.name, part, humanized_dependents, pluralized_dependents
+                    self.step.name,
+                    self.part,
+                    humanized_dependents,
+                    pluralized_dependents,
                 )
             )
-            parts_names = ["{!s}".format(d) for d in sorted(dependents)]
-        else:
-            parts_names = [part]
 
-        super().__init__(
-            step=step,
-            part=part,
-            report="".join(messages),
-            parts_names=" ".join(parts_names),
-        )
+        return "".join(messages)
+
+    @property
+    def parts_names(self) -> str:
+        if self.dependents:
+            return " ".join("{!s}".format(d) for d in sorted(self.dependents))
+        return self.part
 
 
 class SnapcraftEnvironmentError(SnapcraftError):
@@ -170,12 +212,15 @@ class IncompatibleBaseError(SnapcraftError):
     def __init__(
         self, *, base: str, linker_version: str, file_list: Dict[str, str]
     ) -> None:
-        spaced_file_list = ("    {} ({})".format(k, v) for k, v in file_list.items())
-        super().__init__(
-            base=base,
-            linker_version=linker_version,
-            file_list="\n".join(sorted(spaced_file_list)),
+        super().__init__(base=base, linker_version=linker_version)
+        self._file_list = file_list
+
+    @property
+    def file_list(self) -> str:
+        spaced_file_list = (
+            "    {} ({})".format(k, v) for k, v in self._file_list.items()
         )
+        return "\n".join(sorted(spaced_file_list))
 
 
 class PrimeFileConflictError(SnapcraftError):
@@ -229,12 +274,13 @@ class SnapcraftPartConflictError(SnapcraftError):
     )
 
     def __init__(self, *, part_name, other_part_name, conflict_files):
-        spaced_conflict_files = ("    {}".format(i) for i in conflict_files)
-        super().__init__(
-            part_name=part_name,
-            other_part_name=other_part_name,
-            file_paths="\n".join(sorted(spaced_conflict_files)),
-        )
+        super().__init__(part_name=part_name, other_part_name=other_part_name)
+        self.conflict_files = conflict_files
+
+    @property
+    def file_paths(self) -> str:
+        spaced_conflict_files = ("    {}".format(i) for i in self.conflict_files)
+        return "\n".join(sorted(spaced_conflict_files))
 
 
 class SnapcraftOrganizeError(SnapcraftError):
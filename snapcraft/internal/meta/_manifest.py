@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import contextlib
+import copy
 import os
 import json
 from collections import OrderedDict
@@ -29,6 +30,10 @@ if TYPE_CHECKING:
 
 
 def annotate_snapcraft(project: "Project", data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a manifest of data annotated with build information.
+
+    data is not modified, only the entries that are annotated are copied.
+    """
     manifest = OrderedDict()  # type: Dict[str, Any]
     manifest["snapcraft-version"] = snapcraft._get_version()
     manifest["snapcraft-started-at"] = project._get_start_time().isoformat() + "Z"
@@ -41,6 +46,10 @@ def annotate_snapcraft(project: "Project", data: Dict[str, Any]) -> Dict[str, An
 
     for k, v in data.items():
         manifest[k] = v
+    # The parts are annotated below, copy them to leave data untouched.
+    manifest["parts"] = copy.copy(data["parts"])
+    for part_name, part in manifest["parts"].items():
+        manifest["parts"][part_name] = copy.copy(part)
     image_info = os.environ.get("SNAPCRAFT_IMAGE_INFO")
     if image_info:
         try:
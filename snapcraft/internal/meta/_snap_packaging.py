@@ -14,8 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import contextlib
+import functools
 import itertools
 import logging
 import os
@@ -24,16 +24,17 @@ import shlex
 import shutil
 import stat
 import subprocess
-from typing import Any, Dict, List, Optional, Set  # noqa
+from typing import Any, Dict, List, Optional, Pattern, Set  # noqa
 
 from snapcraft import file_utils, formatting_utils, yaml_utils
 from snapcraft import shell_utils, extractors
 from snapcraft.project import _schema
-from snapcraft.internal import common, errors, project_loader
+from snapcraft.internal import errors, project_loader
 from snapcraft.internal.project_loader import _config
 from snapcraft.extractors import _metadata
 from snapcraft.internal.deprecations import handle_deprecation_notice
-from snapcraft.internal.meta import errors as meta_errors, _manifest, _version
+from snapcraft.internal.meta import errors as meta_errors
+from snapcraft.internal.meta.application import clear_executable_cache
 from snapcraft.internal.meta.snap import Snap
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,33 @@ logger = logging.getLogger(__name__)
 # allow leading slashes.
 _APP_COMMAND_PATTERN = re.compile("^[A-Za-z0-9. _#:$-][A-Za-z0-9/. _#:$-]*$")
 
+# The kernel does not read more than this to find an interpreter (BINPRM_BUF_SIZE),
+# so there is no need to read a whole line from a potentially large binary.
+_SHEBANG_MAX_LENGTH = 256
+
+_RUNNER_TEMPLATE = (
+    "#!/bin/sh\n"
+    "{assembled_env}\n"
+    "export LD_LIBRARY_PATH=$SNAP_LIBRARY_PATH:$LD_LIBRARY_PATH\n"
+    'exec "$@"\n'
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_install_path_pattern(parts_dir: str) -> Pattern[str]:
+    return re.compile(r"{}/[a-z0-9][a-z0-9+-]*/install".format(re.escape(parts_dir)))
+
+
+@functools.lru_cache(maxsize=32)
+def _get_prime_dir_pattern(prime_dir: str) -> Pattern[str]:
+    return re.compile(re.escape(prime_dir))
+
+
+def _get_assembled_env(env: List[str], prime_dir: str, parts_dir: str) -> str:
+    assembled_env = "\n".join("export " + e for e in env)
+    assembled_env = assembled_env.replace(prime_dir, "$SNAP")
+    return _get_install_path_pattern(parts_dir).sub("$SNAP", assembled_env)
+
 
 def create_snap_packaging(project_config: _config.Config) -> str:
     """Create snap.yaml and related assets in meta.
@@ -103,17 +131,19 @@ def _update_yaml_with_extracted_metadata(
     # Get the metadata from the pull step first.
     metadata = pull_state.extracted_metadata["metadata"]
 
-    # Now update it using the metadata from the build step (i.e. the data
-    # from the build step takes precedence over the pull step).
-    metadata.update(build_state.extracted_metadata["metadata"])
-
-    # Now make sure any scriptlet data are taken into account. Later steps
-    # take precedence, and scriptlet data (even in earlier steps) take
-    # precedence over extracted data.
-    metadata.update(pull_state.scriptlet_metadata)
-    metadata.update(build_state.scriptlet_metadata)
-    metadata.update(stage_state.scriptlet_metadata)
-    metadata.update(prime_state.scriptlet_metadata)
+    # Now update it, in order of precedence, using the metadata from the build
+    # step (i.e. the data from the build step takes precedence over the pull
+    # step) and then any scriptlet data. Later steps take precedence, and
+    # scriptlet data (even in earlier steps) take precedence over extracted data.
+    # Each update also records the common id, so they are applied one by one.
+    for other_metadata in (
+        build_state.extracted_metadata["metadata"],
+        pull_state.scriptlet_metadata,
+        build_state.scriptlet_metadata,
+        stage_state.scriptlet_metadata,
+        prime_state.scriptlet_metadata,
+    ):
+        metadata.update(other_metadata)
 
     if not metadata:
         # If we didn't end up with any metadata, let's ensure this part was
@@ -135,15 +165,17 @@ def _adopt_info(
 ):
     ignored_keys = _adopt_keys(config_data, extracted_metadata, prime_dir)
     if ignored_keys:
+        if len(ignored_keys) == 1:
+            plural_property, plural_is = "property", "is"
+        else:
+            plural_property, plural_is = "properties", "are"
         logger.warning(
             "The {keys} {plural_property} {plural_is} specified in adopted "
             "info as well as the YAML: taking the {plural_property} from the "
             "YAML".format(
                 keys=formatting_utils.humanize_list(list(ignored_keys), "and"),
-                plural_property=formatting_utils.pluralize(
-                    ignored_keys, "property", "properties"
-                ),
-                plural_is=formatting_utils.pluralize(ignored_keys, "is", "are"),
+                plural_property=plural_property,
+                plural_is=plural_is,
             )
         )
 
@@ -175,9 +207,8 @@ def _adopt_keys(
             ignored_keys.add(key)
 
     if "desktop_file_paths" in metadata_dict and "common_id" in metadata_dict:
-        app_name = _get_app_name_from_common_id(
-            config_data, str(metadata_dict["common_id"])
-        )
+        common_id_index = _get_common_id_index(config_data)
+        app_name = common_id_index.get(str(metadata_dict["common_id"]))
         if app_name and not _desktop_file_exists(app_name):
             for desktop_file_path in [
                 os.path.join(prime_dir, d) for d in metadata_dict["desktop_file_paths"]
@@ -197,32 +228,28 @@ def _icon_file_exists() -> bool:
 
     :returns: True if the icon file exists, False otherwise.
     """
-    for icon_path in (
-        os.path.join(asset_dir, "gui", icon_file)
-        for (asset_dir, icon_file) in itertools.product(
-            ["setup", "snap"], ["icon.png", "icon.svg"]
-        )
-    ):
-        if os.path.exists(icon_path):
+    for asset_dir in ("setup", "snap"):
+        gui_asset_names = _get_gui_asset_names(asset_dir)
+        if "icon.png" in gui_asset_names or "icon.svg" in gui_asset_names:
             return True
     else:
         return False
 
 
-def _get_app_name_from_common_id(config_data: Dict[str, Any], common_id: str) -> str:
-    """Get the snap app name with a common-id.
+def _get_common_id_index(config_data: Dict[str, Any]) -> Dict[str, str]:
+    """Get the snap app names indexed by their common-id.
 
     :params dict config_data: Project values defined in snapcraft.yaml.
-    :params common_id: The common identifier across multiple packaging
-        formats.
-    :returns: The name of the snap app with the common-id.
+    :returns: A mapping of common identifiers across multiple packaging
+        formats to the name of the first snap app using it.
 
     """
-    if "apps" in config_data:
-        for app in config_data["apps"]:
-            if config_data["apps"][app].get("common-id") == common_id:
-                return app
-    return None
+    common_id_index = dict()  # type: Dict[str, str]
+    for app_name, app in config_data.get("apps", {}).items():
+        common_id = app.get("common-id")
+        if common_id:
+            common_id_index.setdefault(common_id, app_name)
+    return common_id_index
 
 
 def _desktop_file_exists(app_name: str) -> bool:
@@ -234,16 +261,30 @@ def _desktop_file_exists(app_name: str) -> bool:
     :params app_name: The name of the snap app.
     :returns: True if the desktop file exists, False otherwise.
     """
-    for desktop_path in (
-        os.path.join(asset_dir, "gui", "{}.desktop".format(app_name))
-        for asset_dir in ["setup", "snap"]
-    ):
-        if os.path.exists(desktop_path):
+    desktop_file_name = "{}.desktop".format(app_name)
+    for asset_dir in ("setup", "snap"):
+        if desktop_file_name in _get_gui_asset_names(asset_dir):
             return True
     else:
         return False
 
 
+def _get_gui_asset_names(asset_dir: str) -> Set[str]:
+    """Get the names of the files in the gui directory of an assets dir.
+
+    A single directory read replaces checking for each candidate file.
+
+    :params asset_dir: The assets dir, 'setup' (deprecated) or 'snap'.
+    :returns: The names of the files, empty if there is no gui directory.
+    """
+    try:
+        with os.scandir(os.path.join(asset_dir, "gui")) as entries:
+            # is_file() follows symlinks, so dangling ones are left out.
+            return {entry.name for entry in entries if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def _update_yaml_with_defaults(config_data, schema):
     # Ensure that grade and confinement have their defaults applied, if
     # necessary. Defaults are taken from the schema. Technically these are the
@@ -322,22 +363,33 @@ class _SnapPackaging:
         self._config_data = project_config.data.copy()
         self._original_snapcraft_yaml = project_config.project.info.get_raw_snapcraft()
 
-        self._install_path_pattern = re.compile(
-            r"{}/[a-z0-9][a-z0-9+-]*/install".format(re.escape(self._parts_dir))
-        )
+        self._install_path_pattern = _get_install_path_pattern(self._parts_dir)
+        self._prime_dir_pattern = _get_prime_dir_pattern(self._prime_dir)
 
         os.makedirs(self.meta_dir, exist_ok=True)
 
+        self._snap_meta_instance = None  # type: Optional[Snap]
+
+    @property
+    def _snap_meta(self) -> Snap:
         # TODO: create_snap_packaging managles config data, so we create
         # a new private instance of snap_meta.  Longer term, this needs
         # to converge with project's snap_meta.
-        self._snap_meta = Snap.from_dict(project_config.data)
+        # It is only built once needed, so cleanup does not pay for it.
+        if self._snap_meta_instance is None:
+            self._snap_meta_instance = Snap.from_dict(self._project_config.data)
+        return self._snap_meta_instance
 
     def cleanup(self):
-        if os.path.exists(self.meta_gui_dir):
-            for f in os.listdir(self.meta_gui_dir):
-                if os.path.splitext(f)[1] == ".desktop":
-                    os.remove(os.path.join(self.meta_gui_dir, f))
+        try:
+            entries = os.scandir(self.meta_gui_dir)
+        except FileNotFoundError:
+            return
+
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".desktop"):
+                    os.remove(entry.path)
 
     def finalize_snap_meta_commands(self) -> None:
         for app_name, app in self._snap_meta.apps.items():
@@ -351,6 +403,8 @@ class _SnapPackaging:
             app.prepend_command_chain = prepend_command_chain
 
     def finalize_snap_meta_version(self) -> None:
+        from snapcraft.internal.meta import _version
+
         # Reparse the version, the order should stick.
         version = self._config_data["version"]
         version_script = self._config_data.get("version-script")
@@ -382,6 +436,10 @@ class _SnapPackaging:
             icon_path = None
 
         snap_name = self._project_config.project.info.name
+
+        # The prime dir may have changed since the last validation.
+        clear_executable_cache()
+
         for app_name, app in self._snap_meta.apps.items():
             app.write_command_wrappers(prime_dir=self._prime_dir)
             app.write_application_desktop_file(
@@ -397,7 +455,7 @@ class _SnapPackaging:
             icon_ext = self._config_data["icon"].split(os.path.extsep)[-1]
             icon_path = os.path.join(self.meta_gui_dir, "icon.{}".format(icon_ext))
             os.makedirs(self.meta_gui_dir, exist_ok=True)
-            if os.path.exists(icon_path):
+            with contextlib.suppress(FileNotFoundError):
                 os.unlink(icon_path)
             file_utils.link_or_copy(self._config_data["icon"], icon_path)
 
@@ -423,24 +481,16 @@ class _SnapPackaging:
                 self._prime_dir, "snap", "command-chain", "snapcraft-runner"
             )
 
-            common.env = self._project_config.snap_env()
-            assembled_env = common.assemble_env()
-            assembled_env = assembled_env.replace(self._prime_dir, "$SNAP")
-            assembled_env = self._install_path_pattern.sub("$SNAP", assembled_env)
+            assembled_env = _get_assembled_env(
+                self._project_config.snap_env(), self._prime_dir, self._parts_dir
+            )
 
             if assembled_env:
                 os.makedirs(os.path.dirname(meta_runner), exist_ok=True)
                 with open(meta_runner, "w") as f:
-                    print("#!/bin/sh", file=f)
-                    print(assembled_env, file=f)
-                    print(
-                        "export LD_LIBRARY_PATH=$SNAP_LIBRARY_PATH:$LD_LIBRARY_PATH",
-                        file=f,
-                    )
-                    print('exec "$@"', file=f)
+                    f.write(_RUNNER_TEMPLATE.format(assembled_env=assembled_env))
                 os.chmod(meta_runner, 0o755)
 
-            common.reset_env()
             command_chain.append(os.path.relpath(meta_runner, self._prime_dir))
 
         return command_chain
@@ -456,10 +506,12 @@ class _SnapPackaging:
 
         # FIXME hide this functionality behind a feature flag for now
         if os.environ.get("SNAPCRAFT_BUILD_INFO"):
+            from snapcraft.internal.meta import _manifest
+
             os.makedirs(prime_snap_dir, exist_ok=True)
             shutil.copy2(self._snapcraft_yaml_path, recorded_snapcraft_yaml_path)
             annotated_snapcraft = _manifest.annotate_snapcraft(
-                self._project_config.project, copy.deepcopy(self._config_data)
+                self._project_config.project, self._config_data
             )
             with open(manifest_file_path, "w") as manifest_file:
                 yaml_utils.dump(annotated_snapcraft, stream=manifest_file)
@@ -474,16 +526,24 @@ class _SnapPackaging:
         for origin in itertools.chain(snap_dir_iter, meta_dir_iter):
             src_dir = os.path.join(snap_assets_dir, origin[1])
             dst_dir = os.path.join(origin[0], origin[1])
-            if os.path.isdir(src_dir):
+            try:
+                assets = os.scandir(src_dir)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+            with assets:
                 os.makedirs(dst_dir, exist_ok=True)
-                for asset in os.listdir(src_dir):
-                    source = os.path.join(src_dir, asset)
-                    destination = os.path.join(dst_dir, asset)
+                for asset in assets:
+                    destination = os.path.join(dst_dir, asset.name)
 
-                    with contextlib.suppress(FileNotFoundError):
-                        os.remove(destination)
+                    # Unchanged assets were hard-linked by a previous run.
+                    if not _is_same_file(asset.path, destination):
+                        with contextlib.suppress(FileNotFoundError):
+                            os.remove(destination)
 
-                    file_utils.link_or_copy(source, destination, follow_symlinks=True)
+                        file_utils.link_or_copy(
+                            asset.path, destination, follow_symlinks=True
+                        )
 
                     # Ensure that the hook is executable in meta/hooks, this is a moot
                     # point considering the prior link_or_copy call, but is technically
@@ -498,17 +558,17 @@ class _SnapPackaging:
         hooks_dir = os.path.join(self._prime_dir, "meta", "hooks")
         if os.path.isdir(snap_hooks_dir):
             os.makedirs(hooks_dir, exist_ok=True)
-            for hook_name in os.listdir(snap_hooks_dir):
-                file_path = os.path.join(snap_hooks_dir, hook_name)
-                # Make sure the hook is executable
-                _prepare_hook(file_path)
+            with os.scandir(snap_hooks_dir) as hooks:
+                for hook in hooks:
+                    # Make sure the hook is executable
+                    _prepare_hook(hook.path)
 
-                hook_exec = os.path.join("$SNAP", "snap", "hooks", hook_name)
-                hook_path = os.path.join(hooks_dir, hook_name)
-                with contextlib.suppress(FileNotFoundError):
-                    os.remove(hook_path)
+                    hook_exec = os.path.join("$SNAP", "snap", "hooks", hook.name)
+                    hook_path = os.path.join(hooks_dir, hook.name)
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(hook_path)
 
-                self._write_wrap_exe(hook_exec, hook_path)
+                    self._write_wrap_exe(hook_exec, hook_path)
 
     def _setup_gui(self):
         # Handles the setup directory which only contains gui assets.
@@ -520,10 +580,10 @@ class _SnapPackaging:
 
         gui_src = os.path.join(setup_dir, "gui")
         if os.path.exists(gui_src):
-            for f in os.listdir(gui_src):
-                if not os.path.exists(self.meta_gui_dir):
-                    os.mkdir(self.meta_gui_dir)
-                shutil.copy2(os.path.join(gui_src, f), self.meta_gui_dir)
+            os.makedirs(self.meta_gui_dir, exist_ok=True)
+            with os.scandir(gui_src) as gui_assets:
+                for gui_asset in gui_assets:
+                    shutil.copy2(gui_asset.path, self.meta_gui_dir)
 
     def _write_wrap_exe(self, wrapexec, wrappath, shebang=None, args=None, cwd=None):
         if args:
@@ -539,20 +599,23 @@ class _SnapPackaging:
             if shebang.startswith("/usr/bin/env "):
                 shebang = shell_utils.which(shebang.split()[1])
             new_shebang = self._install_path_pattern.sub("$SNAP", shebang)
-            new_shebang = re.sub(self._prime_dir, "$SNAP", new_shebang)
+            new_shebang = self._prime_dir_pattern.sub("$SNAP", new_shebang)
             if new_shebang != shebang:
                 # If the shebang was pointing to and executable within the
                 # local 'parts' dir, have the wrapper script execute it
                 # directly, since we can't use $SNAP in the shebang itself.
                 executable = '"{}" "{}"'.format(new_shebang, wrapexec)
 
-        with open(wrappath, "w+") as f:
-            print("#!/bin/sh", file=f)
-            if cwd:
-                print("{}".format(cwd), file=f)
-            print("exec {} {}".format(executable, args), file=f)
+        wrapper = "#!/bin/sh\n"
+        if cwd:
+            wrapper += "{}\n".format(cwd)
+        wrapper += "exec {} {}\n".format(executable, args)
 
-        os.chmod(wrappath, 0o755)
+        fd = os.open(wrappath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+        with os.fdopen(fd, "w") as f:
+            f.write(wrapper)
+            # The mode given to os.open is subject to the umask.
+            os.fchmod(f.fileno(), 0o755)
 
     def _wrap_exe(self, command, basename=None):
         execparts = shlex.split(command)
@@ -563,7 +626,7 @@ class _SnapPackaging:
             wrappath = exepath + ".wrapper"
         shebang = None
 
-        if os.path.exists(wrappath):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(wrappath)
 
         wrapexec = "$SNAP/{}".format(execparts[0])
@@ -572,11 +635,15 @@ class _SnapPackaging:
             wrapexec = execparts[0]
         else:
             with open(exepath, "rb") as exefile:
-                # If the file has a she-bang, the path might be pointing to
-                # the local 'parts' dir. Extract it so that _write_wrap_exe
-                # will have a chance to rewrite it.
-                if exefile.read(2) == b"#!":
-                    shebang = exefile.readline().strip().decode("utf-8")
+                head = exefile.read(_SHEBANG_MAX_LENGTH)
+                if head.startswith(b"#!") and b"\n" not in head:
+                    # An unusually long she-bang, read the rest of it.
+                    head += exefile.readline()
+            # If the file has a she-bang, the path might be pointing to
+            # the local 'parts' dir. Extract it so that _write_wrap_exe
+            # will have a chance to rewrite it.
+            if head.startswith(b"#!"):
+                shebang = head[2:].split(b"\n", 1)[0].strip().decode("utf-8", "replace")
 
         self._write_wrap_exe(wrapexec, wrappath, shebang=shebang, args=execparts[1:])
 
@@ -590,10 +657,10 @@ class _SnapPackaging:
         ):
             return
 
-        common_id_list = self._extracted_metadata.common_id_list
+        common_ids = set(self._extracted_metadata.common_id_list)
         for app in self._config_data["apps"]:
             app_common_id = self._config_data["apps"][app].get("common-id")
-            if app_common_id not in common_id_list:
+            if app_common_id not in common_ids:
                 logger.warning(
                     "Common ID {common_id!r} specified in app {app!r} is "
                     "not used in any metadata file.".format(
@@ -611,7 +678,29 @@ def _find_bin(binary, basedir):
         raise meta_errors.CommandError(binary)
 
 
+def _is_same_file(source: str, destination: str) -> bool:
+    # The source is followed as it would be when linking, the destination is not
+    # so that a symlink left in its place is still replaced.
+    try:
+        source_stat = os.stat(source)
+        destination_stat = os.lstat(destination)
+    except FileNotFoundError:
+        return False
+
+    return (source_stat.st_dev, source_stat.st_ino) == (
+        destination_stat.st_dev,
+        destination_stat.st_ino,
+    )
+
+
 def _prepare_hook(hook_path):
-    # Ensure hook is executable
+    # Ensure hook is executable, hooks are usually hard links to the
+    # project's files so leave their mode alone if they already are.
     if not os.stat(hook_path).st_mode & stat.S_IEXEC:
-        os.chmod(hook_path, 0o755)
+        try:
+            os.chmod(hook_path, 0o755)
+        except PermissionError:
+            raise meta_errors.HookValidationError(
+                hook_name=os.path.basename(hook_path),
+                message="hook is not executable and its mode cannot be changed",
+            )
@@ -14,11 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import collections.abc
+import functools
 import os
 
-from copy import deepcopy
 from snapcraft import yaml_utils
-from typing import Any, Dict, List, Optional, Sequence  # noqa: F401
+from typing import Any, Dict, List, Mapping, Optional, Sequence  # noqa: F401
 
 from . import errors
 from ._utils import _executable_is_valid
@@ -26,8 +27,58 @@ from .command import Command
 from .desktop import DesktopFile
 
 
-_COMMAND_ENTRIES = ["command", "stop-command"]
-_MASSAGED_BASES = ["core", "core18"]
+_MASSAGED_BASES = frozenset(["core", "core18"])
+
+
+class _EmptyMapping(collections.abc.Mapping):
+    """Read-only empty mapping which, unlike MappingProxyType, can be copied."""
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+# Shared defaults for unset entries, so that each app does not allocate its own
+# empty containers. They are read-only; assign a new value to change an entry.
+_EMPTY_DICT: Mapping[str, Any] = _EmptyMapping()
+_EMPTY_LIST: Sequence[str] = ()
+
+
+@functools.lru_cache(maxsize=4096)
+def _command_chain_executable_is_valid(path: str) -> bool:
+    # The same command-chain entries are usually shared by many apps.
+    return _executable_is_valid(path)
+
+
+def clear_executable_cache() -> None:
+    """Forget which command-chain executables were found to be valid.
+
+    Must be called before validating apps once the prime dir may have changed.
+    """
+    _command_chain_executable_is_valid.cache_clear()
+
+
+def _clone(obj: Any) -> Any:
+    """Copy the dicts and lists of a loaded snapcraft.yaml entry.
+
+    Cheaper than deepcopy as the leaves are all immutable scalars.
+    """
+    if isinstance(obj, dict):
+        return type(obj)((key, _clone(value)) for key, value in obj.items())
+    elif isinstance(obj, list):
+        return [_clone(item) for item in obj]
+    return obj
 
 
 class Application:
@@ -51,28 +102,26 @@ class Application:
         """
         self._app_name = app_name
 
-        self._app_properties = app_properties
-        if self._app_properties is None:
-            self._app_properties: Dict[str, Any] = dict()
+        # Copied and updated in to_dict, so not shared.
+        self._app_properties: Dict[str, Any] = (
+            dict() if app_properties is None else app_properties
+        )
 
         self.adapter = adapter
         self.desktop = desktop
 
-        self.command_chain = command_chain
-        if self.command_chain is None:
-            self.command_chain: List[str] = list()
-
-        self.prepend_command_chain = prepend_command_chain
-        if self.prepend_command_chain is None:
-            self.prepend_command_chain: List[str] = list()
-
-        self.commands = commands
-        if self.commands is None:
-            self.commands: Dict[str, Command] = dict()
-
-        self.passthrough = passthrough
-        if self.passthrough is None:
-            self.passthrough: Dict[str, Any] = dict()
+        self.command_chain: Sequence[str] = (
+            _EMPTY_LIST if command_chain is None else command_chain
+        )
+        self.prepend_command_chain: Sequence[str] = (
+            _EMPTY_LIST if prepend_command_chain is None else prepend_command_chain
+        )
+        self.commands: Mapping[str, Command] = (
+            _EMPTY_DICT if commands is None else commands
+        )
+        self.passthrough: Mapping[str, Any] = (
+            _EMPTY_DICT if passthrough is None else passthrough
+        )
 
     @property
     def app_name(self) -> str:
@@ -81,12 +130,15 @@ class Application:
 
     def can_use_wrapper(self, base: str) -> bool:
         """Return if an wrapper should be allowed for app entries."""
+        return self._can_use_wrapper(massage_command=self._massage_commands(base=base))
+
+    def _can_use_wrapper(self, *, massage_command: bool) -> bool:
         # Force use of no wrappers when command-chain is set.
         if self.command_chain:
             return False
 
         # We only allow wrappers for core and core18.
-        if not self._massage_commands(base=base):
+        if not massage_command:
             return False
 
         # Now that command-chain and bases have been checked for,
@@ -100,8 +152,8 @@ class Application:
         return base in _MASSAGED_BASES
 
     def prime_commands(self, *, base: str, prime_dir: str) -> None:
-        can_use_wrapper = self.can_use_wrapper(base)
         massage_command = self._massage_commands(base=base)
+        can_use_wrapper = self._can_use_wrapper(massage_command=massage_command)
         for command in self.commands.values():
             command.prime_command(
                 can_use_wrapper=can_use_wrapper,
@@ -134,7 +186,7 @@ class Application:
 
             # command-chain entries must always be relative to the root of
             # the snap, i.e. PATH is not used.
-            if not _executable_is_valid(executable_path):
+            if not _command_chain_executable_is_valid(executable_path):
                 raise errors.InvalidCommandChainError(item, self.app_name)
 
     def validate(self) -> None:
@@ -147,58 +199,73 @@ class Application:
     def from_dict(cls, *, app_dict: Dict[str, Any], app_name: str) -> "Application":
         """Create application from dictionary."""
 
-        app_dict = deepcopy(app_dict)
-        app = Application(
+        app_dict = _clone(app_dict)
+
+        # Populate commands from app_properties.
+        commands: Dict[str, Command] = dict()
+        command = app_dict.get("command")
+        if command is not None:
+            commands["command"] = Command(
+                app_name=app_name, command_name="command", command=command
+            )
+        stop_command = app_dict.get("stop-command")
+        if stop_command is not None:
+            commands["stop-command"] = Command(
+                app_name=app_name, command_name="stop-command", command=stop_command
+            )
+
+        return Application(
             app_name=app_name,
             app_properties=app_dict,
             adapter=app_dict.get("adapter", None),
             desktop=app_dict.get("desktop", None),
             command_chain=app_dict.get("command-chain", None),
             passthrough=app_dict.get("passthrough", None),
+            commands=commands,
         )
 
-        # Populate commands from app_properties.
-        for command_name in _COMMAND_ENTRIES:
-            if command_name not in app_dict:
-                continue
-
-            app.commands[command_name] = Command(
-                app_name=app_name,
-                command_name=command_name,
-                command=app_dict[command_name],
-            )
-
-        return app
-
     def to_dict(self) -> Dict[str, Any]:
         """Returns and ordered dictonary with the transformed app entry."""
 
-        app_dict = deepcopy(self._app_properties)
+        # Only top level keys and sockets are modified, the rest is shared.
+        app_dict = self._app_properties.copy()
 
         for command_name, command in self.commands.items():
             app_dict[command_name] = command.command
 
         if self.prepend_command_chain or self.command_chain:
-            app_dict["command-chain"] = self.prepend_command_chain + self.command_chain
+            app_dict["command-chain"] = [
+                *self.prepend_command_chain,
+                *self.command_chain,
+            ]
 
         # Adjust socket values to formats snap.yaml accepts
-        sockets = app_dict.get("sockets", dict())
-        for socket in sockets.values():
-            mode = socket.get("socket-mode")
-            if mode is not None:
-                socket["socket-mode"] = yaml_utils.OctInt(mode)
+        sockets = app_dict.get("sockets")
+        if sockets:
+            sockets = sockets.copy()
+            for socket_name, socket in sockets.items():
+                mode = socket.get("socket-mode")
+                if mode is not None:
+                    socket = socket.copy()
+                    socket["socket-mode"] = yaml_utils.OctInt(mode)
+                    sockets[socket_name] = socket
+            app_dict["sockets"] = sockets
 
         # Strip keys.
-        for key in ["adapter", "desktop"]:
-            if key in app_dict:
-                app_dict.pop(key)
+        app_dict.pop("adapter", None)
+        app_dict.pop("desktop", None)
 
-        # Apply passthrough keys.
-        app_dict.update(self.passthrough)
+        # Apply passthrough keys, copied so that they do not alias the
+        # passthrough entry (which the dumper would turn into YAML anchors).
+        if self.passthrough:
+            app_dict.update(_clone(dict(self.passthrough)))
         return app_dict
 
-    def __repr__(self) -> str:
-        return repr(self.__dict__)
-
-    def __str__(self) -> str:
+    def describe(self) -> str:
+        """Return all the attributes of the application, for verbose dumps."""
         return str(self.__dict__)
+
+    def __repr__(self) -> str:
+        return "<Application {!r} commands={!r}>".format(
+            self._app_name, list(self.commands)
+        )
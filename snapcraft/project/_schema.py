@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import functools
 import os
 
 import json
@@ -24,6 +25,27 @@ from . import errors
 from snapcraft.internal import common
 
 
+@functools.lru_cache(maxsize=None)
+def _load_schema_file(schema_file):
+    try:
+        with open(schema_file) as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        raise errors.YamlValidationError(
+            "snapcraft validation file is missing from installation path"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_schema_validator(schema_file):
+    # Checking the schema itself is as costly as validating a snapcraft.yaml,
+    # so it is done only once for each schema file.
+    schema = _load_schema_file(schema_file)
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema, format_checker=jsonschema.FormatChecker())
+
+
 class Validator:
     def __init__(self, snapcraft_yaml=None):
         """Create a validation instance for snapcraft_yaml."""
@@ -51,22 +73,14 @@ class Validator:
         return self._schema["definitions"].copy()
 
     def _load_schema(self):
-        schema_file = os.path.abspath(
+        self._schema_file = os.path.abspath(
             os.path.join(common.get_schemadir(), "snapcraft.json")
         )
-        try:
-            with open(schema_file) as fp:
-                self._schema = json.load(fp)
-        except FileNotFoundError:
-            raise errors.YamlValidationError(
-                "snapcraft validation file is missing from installation path"
-            )
+        # The loaded schema is shared by all validators, it must not be modified.
+        self._schema = _load_schema_file(self._schema_file)
 
     def validate(self, *, source="snapcraft.yaml"):
-        format_check = jsonschema.FormatChecker()
         try:
-            jsonschema.validate(
-                self._snapcraft, self._schema, format_checker=format_check
-            )
+            _get_schema_validator(self._schema_file).validate(self._snapcraft)
         except jsonschema.ValidationError as e:
             raise errors.YamlValidationError.from_validation_error(e, source=source)
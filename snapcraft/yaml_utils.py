@@ -40,18 +40,11 @@ def dump(data: Union[Dict[str, Any], yaml.YAMLObject], *, stream: TextIO = None)
 
 
 class _SafeOrderedLoader(CSafeLoader):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.add_constructor(
-            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _dict_constructor
-        )
+    pass
 
 
 class _SafeOrderedDumper(CSafeDumper):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.add_representer(str, _str_presenter)
-        self.add_representer(collections.OrderedDict, _dict_representer)
+    pass
 
 
 class SnapcraftYAMLObject(yaml.YAMLObject):
@@ -89,6 +82,15 @@ def _str_presenter(dumper, data):
     return dumper.represent_scalar("tag:yaml.org,2002:str", data)
 
 
+# Register these once on the classes rather than every time a loader or dumper
+# is instantiated, i.e. on every load() and dump().
+_SafeOrderedLoader.add_constructor(
+    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _dict_constructor
+)
+_SafeOrderedDumper.add_representer(str, _str_presenter)
+_SafeOrderedDumper.add_representer(collections.OrderedDict, _dict_representer)
+
+
 class OctInt(SnapcraftYAMLObject):
     """An int represented in octal form."""
 
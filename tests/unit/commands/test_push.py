@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import functools
 import os
 from unittest import mock
 
@@ -30,31 +31,36 @@ import tests
 from . import FakeStoreCommandsBaseTestCase
 
 
+_DATA_DIR = os.path.join(os.path.dirname(tests.__file__), "data")
+
+# Read-only, shared by all the tests.
+_SNAP_STATUS = {
+    "amd64": [
+        {
+            "info": "specific",
+            "version": "1.0-amd64",
+            "channel": "stable",
+            "revision": 2,
+        },
+        {"info": "specific", "version": "1.1-amd64", "channel": "beta", "revision": 4},
+        {"info": "tracking", "channel": "edge"},
+    ]
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_sha3_384(path):
+    return file_utils.calculate_sha3_384(path)
+
+
 class PushCommandBaseTestCase(FakeStoreCommandsBaseTestCase):
+
+    snap_file = os.path.join(_DATA_DIR, "test-snap.snap")
+
     def setUp(self):
         super().setUp()
 
-        self.fake_store_status.mock.return_value = {
-            "amd64": [
-                {
-                    "info": "specific",
-                    "version": "1.0-amd64",
-                    "channel": "stable",
-                    "revision": 2,
-                },
-                {
-                    "info": "specific",
-                    "version": "1.1-amd64",
-                    "channel": "beta",
-                    "revision": 4,
-                },
-                {"info": "tracking", "channel": "edge"},
-            ]
-        }
-
-        self.snap_file = os.path.join(
-            os.path.dirname(tests.__file__), "data", "test-snap.snap"
-        )
+        self.fake_store_status.mock.return_value = _SNAP_STATUS
 
 
 class PushCommandTestCase(PushCommandBaseTestCase):
@@ -84,9 +90,7 @@ class PushCommandTestCase(PushCommandBaseTestCase):
         )
 
     def test_push_with_started_at(self):
-        snap_file = os.path.join(
-            os.path.dirname(tests.__file__), "data", "test-snap-with-started-at.snap"
-        )
+        snap_file = os.path.join(_DATA_DIR, "test-snap-with-started-at.snap")
 
         # Upload
         result = self.run_command(["push", snap_file])
@@ -126,9 +130,7 @@ class PushCommandTestCase(PushCommandBaseTestCase):
         self.assertThat(result.exit_code, Equals(2))
 
     def test_push_invalid_snap_must_raise_exception(self):
-        snap_path = os.path.join(
-            os.path.dirname(tests.__file__), "data", "invalid.snap"
-        )
+        snap_path = os.path.join(_DATA_DIR, "invalid.snap")
 
         raised = self.assertRaises(
             internal.errors.SnapDataExtractionError,
@@ -308,9 +310,7 @@ class PushCommandDeltasTestCase(PushCommandBaseTestCase):
             "snap_hashes",
             "amd64",
         )
-        cached_snap = os.path.join(
-            snap_cache, file_utils.calculate_sha3_384(self.snap_file)
-        )
+        cached_snap = os.path.join(snap_cache, _cached_sha3_384(self.snap_file))
 
         self.assertThat(cached_snap, FileExists())
 
@@ -501,9 +501,7 @@ class PushCommandDeltasWithPruneTestCase(PushCommandBaseTestCase):
 
         self.assertThat(result.exit_code, Equals(0))
 
-        real_cached_snap = os.path.join(
-            snap_cache, file_utils.calculate_sha3_384(self.snap_file)
-        )
+        real_cached_snap = os.path.join(snap_cache, _cached_sha3_384(self.snap_file))
 
         self.assertThat(os.path.join(snap_cache, real_cached_snap), FileExists())
 
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
 import os
 
 from testtools.matchers import Contains, Equals, FileExists, Not
@@ -139,6 +140,62 @@ class AppCommandTest(unit.TestCase):
             Equals(yaml_utils.OctInt),
         )
 
+    def test_to_dict_does_not_modify_app_properties(self):
+        app_dict = {
+            "command": "test-command",
+            "adapter": "none",
+            "sockets": {"sock": {"listen-stream": 8080, "socket-mode": 1000}},
+        }
+        app = application.Application.from_dict(app_name="foo", app_dict=app_dict)
+
+        app.to_dict()
+        app.to_dict()
+
+        self.expectThat(
+            type(app_dict["sockets"]["sock"]["socket-mode"]),
+            Not(Equals(yaml_utils.OctInt)),
+        )
+        self.expectThat(
+            type(app.to_dict()["sockets"]["sock"]["socket-mode"]),
+            Equals(yaml_utils.OctInt),
+        )
+        self.expectThat(app.to_dict(), Not(Contains("adapter")))
+        self.expectThat(app_dict, Contains("adapter"))
+
+    def test_to_dict_nested_passthrough_without_aliases(self):
+        app = application.Application.from_dict(
+            app_name="foo",
+            app_dict={
+                "command": "test-command",
+                "passthrough": {"sockets": {"sock": {"listen-stream": 8080}}},
+            },
+        )
+
+        app_yaml = yaml_utils.dump(app.to_dict())
+
+        self.expectThat(app_yaml, Not(Contains("&id")))
+        self.expectThat(app_yaml, Not(Contains("*id")))
+
+    def test_deepcopy_with_unset_entries(self):
+        app = application.Application(app_name="foo")
+
+        app_copy = copy.deepcopy(app)
+
+        self.assertThat(app_copy.to_dict(), Equals(app.to_dict()))
+
+    def test_repr(self):
+        app = application.Application.from_dict(
+            app_name="foo",
+            app_dict={"command": "test-command", "stop-command": "test-stop-command"},
+        )
+
+        self.expectThat(
+            repr(app),
+            Equals("<Application 'foo' commands=['command', 'stop-command']>"),
+        )
+        self.expectThat(str(app), Equals(repr(app)))
+        self.expectThat(app.describe(), Contains("'_app_name': 'foo'"))
+
     def test_no_command_chain_prepended(self):
         app = application.Application.from_dict(
             app_name="foo", app_dict={"command": "test-command"}
@@ -226,6 +283,24 @@ class InvalidCommandChainTest(unit.TestCase):
             prime_dir=self.path,
         )
 
+    def test_command_chain_validation_cached_until_cleared(self):
+        open("command-chain", "w").close()
+        os.chmod("command-chain", 0o755)
+        app = application.Application.from_dict(
+            app_name="foo", app_dict={"command-chain": ["command-chain"]}
+        )
+
+        app.validate_command_chain_executables(prime_dir=self.path)
+        os.chmod("command-chain", 0o644)
+        app.validate_command_chain_executables(prime_dir=self.path)
+        application.clear_executable_cache()
+
+        self.assertRaises(
+            errors.InvalidCommandChainError,
+            app.validate_command_chain_executables,
+            prime_dir=self.path,
+        )
+
 
 class DesktopFileTest(unit.TestCase):
     def test_desktop_file(self):
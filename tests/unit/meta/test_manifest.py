@@ -0,0 +1,80 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import os
+from collections import OrderedDict
+
+from testtools.matchers import Equals
+
+from snapcraft import yaml_utils
+from snapcraft.internal import states, steps
+from snapcraft.internal.meta import _manifest
+from snapcraft.project import Project
+from tests import unit
+
+
+class AnnotateSnapcraftTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.project = Project()
+        states.GlobalState(assets={"build-packages": ["gcc"], "build-snaps": []}).save(
+            filepath=self.project._get_global_state_file_path()
+        )
+
+        state_dir = os.path.join(self.project.parts_dir, "test-part", "state")
+        os.makedirs(state_dir)
+        pull_state = states.PullState(
+            [],
+            build_packages=["make"],
+            stage_packages=["libfoo"],
+            source_details={"source-commit": "abcdef"},
+        )
+        build_state = states.BuildState([], machine_assets={"uname": "Linux"})
+        for step, state in ((steps.PULL, pull_state), (steps.BUILD, build_state)):
+            with open(states.get_step_state_file(state_dir, step), "w") as f:
+                yaml_utils.dump(state, stream=f)
+
+    def test_data_is_not_modified(self):
+        data = OrderedDict(
+            [
+                ("name", "test-snap"),
+                ("parts", OrderedDict([("test-part", {"plugin": "nil"})])),
+            ]
+        )
+        original_data = copy.deepcopy(data)
+
+        manifest = _manifest.annotate_snapcraft(self.project, data)
+
+        self.expectThat(data, Equals(original_data))
+        self.expectThat(data["parts"], Equals(original_data["parts"]))
+        self.expectThat(
+            data["parts"]["test-part"], Equals(original_data["parts"]["test-part"])
+        )
+        self.expectThat(
+            manifest["parts"]["test-part"],
+            Equals(
+                {
+                    "plugin": "nil",
+                    "build-packages": ["make"],
+                    "stage-packages": ["libfoo"],
+                    "source-commit": "abcdef",
+                    "uname": "Linux",
+                }
+            ),
+        )
+        self.expectThat(manifest["build-packages"], Equals(["gcc"]))
@@ -36,7 +36,7 @@ from testtools.matchers import (
 )
 
 from snapcraft.internal.meta import errors as meta_errors, _snap_packaging
-from snapcraft import extractors, yaml_utils
+from snapcraft import extractors, file_utils, yaml_utils
 from snapcraft.project import Project
 from snapcraft.project import errors as project_errors
 from snapcraft.internal import errors
@@ -334,6 +334,24 @@ class CreateTestCase(CreateBaseTestCase):
             Equals([os.path.join("snap", "command-chain", "snapcraft-runner"), "bar"]),
         )
 
+    def test_command_chain_runner_script(self):
+        self.config_data["apps"] = {"app": {"command": "foo"}}
+        _create_file(os.path.join(self.prime_dir, "foo"), executable=True)
+
+        self.generate_meta_yaml()
+
+        runner = os.path.join(
+            self.prime_dir, "snap", "command-chain", "snapcraft-runner"
+        )
+        with open(runner) as f:
+            lines = f.read().split("\n")
+        self.expectThat(lines[0], Equals("#!/bin/sh"))
+        self.expectThat(
+            lines[-3],
+            Equals("export LD_LIBRARY_PATH=$SNAP_LIBRARY_PATH:$LD_LIBRARY_PATH"),
+        )
+        self.expectThat(lines[-2:], Equals(['exec "$@"', ""]))
+
 
 class StopModeTestCase(CreateBaseTestCase):
 
@@ -1122,6 +1140,32 @@ class WriteSnapDirectoryTestCase(CreateBaseTestCase):
             os.stat(os.path.join(self.hooks_dir, "test-hook")).st_mode & stat.S_IEXEC
         )
 
+    def test_executable_snap_hooks_keep_their_mode(self):
+        _create_file(os.path.join(self.snap_dir, "snapcraft.yaml"))
+        hook_path = os.path.join(self.snap_dir, "hooks", "test-hook")
+        _create_file(hook_path)
+        os.chmod(hook_path, 0o700)
+
+        self.generate_meta_yaml()
+
+        self.assertThat(stat.S_IMODE(os.stat(hook_path).st_mode), Equals(0o700))
+
+    def test_snap_hooks_without_chmod_permission(self):
+        _create_file(os.path.join(self.snap_dir, "snapcraft.yaml"))
+        _create_file(os.path.join(self.snap_dir, "hooks", "test-hook"))
+
+        real_chmod = os.chmod
+
+        def chmod_denied(name, *args, **kwargs):
+            # Simulate hooks linked from files owned by someone else
+            if name.startswith(self.prime_dir):
+                raise PermissionError(name)
+            real_chmod(name, *args, **kwargs)
+
+        self.useFixture(fixtures.MonkeyPatch("os.chmod", chmod_denied))
+
+        self.assertRaises(meta_errors.HookValidationError, self.generate_meta_yaml)
+
     def test_snap_hooks_not_does_not_fail_on_symlink(self):
         # Setup a snap directory containing a few things.
         _create_file(os.path.join(self.snap_dir, "snapcraft.yaml"))
@@ -1145,6 +1189,91 @@ class WriteSnapDirectoryTestCase(CreateBaseTestCase):
 
         self.assertThat(test_hook_symlink_stat.st_ino, Equals(test_hook_stat.st_ino))
 
+    def test_unchanged_snap_hooks_are_not_relinked(self):
+        _create_file(os.path.join(self.snap_dir, "snapcraft.yaml"))
+        _create_file(os.path.join(self.snap_dir, "hooks", "test-hook"), executable=True)
+        self.generate_meta_yaml()
+
+        with patch(
+            "snapcraft.file_utils.link_or_copy", wraps=file_utils.link_or_copy
+        ) as link_or_copy_mock:
+            self.generate_meta_yaml()
+
+        prime_hook = os.path.join(self.prime_dir, "snap", "hooks", "test-hook")
+        destinations = [args[1] for args, _ in link_or_copy_mock.call_args_list]
+        self.assertThat(destinations, Not(Contains(prime_hook)))
+        self.assertThat(prime_hook, FileExists())
+
+
+class WrapExeTestCase(CreateBaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # The prime dir contains regex metacharacters.
+        self.prime_dir = os.path.join(self.path, "prime+1.0")
+        self.generate_meta_yaml(actual_prime_dir=self.prime_dir)
+        self.packaging = _snap_packaging._SnapPackaging(
+            self.config, extracted_metadata=None
+        )
+
+    def wrap_exe_with_shebang(self, interpreter):
+        _create_file(
+            os.path.join(self.prime_dir, "bin", "app"),
+            content="#!{}\n".format(interpreter),
+            executable=True,
+        )
+        wrapper_path = self.packaging._wrap_exe("bin/app")
+
+        with open(os.path.join(self.prime_dir, wrapper_path)) as wrapper_file:
+            return wrapper_file.read()
+
+    def test_shebang_in_prime_dir_is_rewritten(self):
+        wrapper = self.wrap_exe_with_shebang(
+            os.path.join(self.prime_dir, "usr", "bin", "python3")
+        )
+
+        self.assertThat(
+            wrapper, Contains('exec "$SNAP/usr/bin/python3" "$SNAP/bin/app" "$@"')
+        )
+
+    def test_shebang_in_lookalike_dir_is_not_rewritten(self):
+        # Only matches the prime dir if "+" and "." are not escaped.
+        lookalike_dir = os.path.join(self.path, "primee1x0")
+
+        wrapper = self.wrap_exe_with_shebang(
+            os.path.join(lookalike_dir, "usr", "bin", "python3")
+        )
+
+        self.assertThat(wrapper, Contains('exec "$SNAP/bin/app" "$@"'))
+        self.assertThat(wrapper, Not(Contains("$SNAP/usr/bin/python3")))
+
+    def test_long_shebang_in_prime_dir_is_rewritten(self):
+        interpreter_dir = os.path.join(self.prime_dir, *["usr"] * 100, "bin")
+
+        wrapper = self.wrap_exe_with_shebang(os.path.join(interpreter_dir, "python3"))
+
+        self.assertThat(
+            wrapper,
+            Contains(
+                'exec "{}/python3" "$SNAP/bin/app" "$@"'.format(
+                    interpreter_dir.replace(self.prime_dir, "$SNAP")
+                )
+            ),
+        )
+
+
+class GuiAssetsTestCase(unit.TestCase):
+    def test_icon_file_exists(self):
+        _create_file(os.path.join("snap", "gui", "icon.svg"))
+
+        self.assertTrue(_snap_packaging._icon_file_exists())
+
+    def test_icon_file_dangling_symlink(self):
+        os.makedirs(os.path.join("snap", "gui"))
+        os.symlink("missing.png", os.path.join("snap", "gui", "icon.png"))
+
+        self.assertFalse(_snap_packaging._icon_file_exists())
+
 
 class GenerateHookWrappersTestCase(CreateBaseTestCase):
     def test_generate_hook_wrappers(self):
@@ -14,7 +14,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import OrderedDict
 from snapcraft.internal.meta import errors
 from snapcraft.internal.meta.plugs import Plug, ContentPlug
 from tests import unit
@@ -40,7 +39,7 @@ class GenericPlugTests(unit.TestCase):
         self.assertRaises(errors.PlugValidationError, plug.validate)
 
     def test_invalid_from_dict_raises_exception(self):
-        plug_dict = OrderedDict({})
+        plug_dict = {}
         plug_name = "plug-test"
 
         plug = Plug.from_dict(plug_dict=plug_dict, plug_name=plug_name)
@@ -48,7 +47,7 @@ class GenericPlugTests(unit.TestCase):
         self.assertRaises(errors.PlugValidationError, plug.validate)
 
     def test_valid_from_dict(self):
-        plug_dict = OrderedDict({"interface": "somevalue", "someprop": "somevalue"})
+        plug_dict = {"interface": "somevalue", "someprop": "somevalue"}
         plug_name = "plug-test"
 
         plug = Plug.from_dict(plug_dict=plug_dict, plug_name=plug_name)
@@ -63,7 +62,7 @@ class ContentPlugTests(unit.TestCase):
         self.assertRaises(errors.PlugValidationError, plug.validate)
 
     def test_invalid_target_from_dict_raise_exception(self):
-        plug_dict = OrderedDict({"interface": "content", "target": ""})
+        plug_dict = {"interface": "content", "target": ""}
 
         plug = Plug.from_dict(plug_dict=plug_dict, plug_name="plug-test")
 
@@ -75,14 +74,12 @@ class ContentPlugTests(unit.TestCase):
         self.assertEqual("plug-test", plug.content)
 
     def test_basic_from_dict(self):
-        plug_dict = OrderedDict(
-            {
-                "interface": "content",
-                "content": "content",
-                "target": "target",
-                "default-provider": "gtk-common-themes:gtk-3-themes",
-            }
-        )
+        plug_dict = {
+            "interface": "content",
+            "content": "content",
+            "target": "target",
+            "default-provider": "gtk-common-themes:gtk-3-themes",
+        }
         plug_name = "plug-test"
         plug_provider = "gtk-common-themes"
 
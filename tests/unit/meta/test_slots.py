@@ -14,13 +14,35 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import OrderedDict
+import logging
+
+import fixtures
+import testscenarios
+import testtools
+
 from snapcraft.internal.meta import errors
 from snapcraft.internal.meta.slots import Slot, ContentSlot, DbusSlot
-from tests import unit
+from tests import fixture_setup
+
+
+# Shared by the content path tests, which must not modify them.
+_ONE_PATH = ["some/path"]
+_ONE_PATH_SET = frozenset(_ONE_PATH)
+
+
+class SlotTestCase(testscenarios.WithScenarios, testtools.TestCase):
+    """The isolation of unit.TestCase that slots need, without fake snapd."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.useFixture(fixture_setup.TempCWD())
+        xdg_path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixture_setup.TempXDG(xdg_path))
+        self.useFixture(fixtures.FakeLogger(level=logging.ERROR))
 
 
-class GenericSlotTests(unit.TestCase):
+class GenericSlotTests(SlotTestCase):
     def test_slot_name(self):
         slot_name = "slot-test"
 
@@ -37,18 +59,20 @@ class GenericSlotTests(unit.TestCase):
 
         slot = Slot(slot_name=slot_name)
 
-        self.assertRaises(errors.SlotValidationError, slot.validate)
+        with testtools.ExpectedException(errors.SlotValidationError):
+            slot.validate()
 
     def test_invalid_from_dict_raises_exception(self):
-        slot_dict = OrderedDict({})
+        slot_dict = {}
         slot_name = "slot-test"
 
         slot = Slot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
 
-        self.assertRaises(errors.SlotValidationError, slot.validate)
+        with testtools.ExpectedException(errors.SlotValidationError):
+            slot.validate()
 
     def test_valid_from_dict(self):
-        slot_dict = OrderedDict({"interface": "somevalue", "someprop": "somevalue"})
+        slot_dict = {"interface": "somevalue", "someprop": "somevalue"}
         slot_name = "slot-test"
 
         slot = Slot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
@@ -56,47 +80,54 @@ class GenericSlotTests(unit.TestCase):
         slot.validate()
 
 
-class ContentSlotTests(unit.TestCase):
+class ContentSlotTests(SlotTestCase):
+    scenarios = (
+        (
+            "empty",
+            dict(
+                make_slot=lambda slot_name: ContentSlot(slot_name=slot_name),
+                # "use_source_key" is default, account for that.
+                expected_dict={"interface": "content", "source": {}},
+            ),
+        ),
+        (
+            "empty from dict",
+            dict(
+                make_slot=lambda slot_name: Slot.from_dict(
+                    slot_dict={"interface": "content"}, slot_name=slot_name
+                ),
+                expected_dict={"interface": "content"},
+            ),
+        ),
+        (
+            "empty force no source",
+            dict(
+                make_slot=lambda slot_name: ContentSlot(
+                    use_source_key=False, slot_name=slot_name
+                ),
+                expected_dict={"interface": "content"},
+            ),
+        ),
+    )
+
     def test_empty(self):
-        slot_dict = OrderedDict({"interface": "content"})
         slot_name = "slot-test"
 
-        slot = ContentSlot(slot_name=slot_name)
-
-        # "use_source_key" is default, account for that.
-        transformed_dict = slot_dict.copy()
-        transformed_dict["source"] = {}
-
-        self.assertEqual(transformed_dict, slot.to_dict())
-        self.assertEqual(slot_name, slot.slot_name)
-        self.assertRaises(errors.SlotValidationError, slot.validate)
-        self.assertEqual(set(), slot.get_content_dirs(installed_path=""))
-
-    def test_empty_from_dict(self):
-        slot_dict = OrderedDict({"interface": "content"})
-        slot_name = "slot-name"
-
-        slot = Slot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
+        slot = self.make_slot(slot_name)
 
         self.assertIsInstance(slot, ContentSlot)
-        self.assertEqual(slot_dict, slot.to_dict())
+        self.assertEqual(self.expected_dict, slot.to_dict())
         self.assertEqual(slot_name, slot.slot_name)
-        self.assertRaises(errors.SlotValidationError, slot.validate)
+        with testtools.ExpectedException(errors.SlotValidationError):
+            slot.validate()
         self.assertEqual(set(), slot.get_content_dirs(installed_path=""))
 
-    def test_empty_force_no_source(self):
-        slot_dict = OrderedDict({"interface": "content"})
-        slot_name = "slot-test"
 
-        slot = ContentSlot(use_source_key=False, slot_name=slot_name)
-
-        self.assertEqual(slot_dict, slot.to_dict())
-        self.assertEqual(slot_name, slot.slot_name)
-        self.assertRaises(errors.SlotValidationError, slot.validate)
-        self.assertEqual(set(), slot.get_content_dirs(installed_path=""))
+class ContentSlotPathTests(SlotTestCase):
+    scenarios = [(key, dict(key=key)) for key in ("read", "write")]
 
-    def test_read_from_dict(self):
-        slot_dict = OrderedDict({"interface": "content", "read": ["some/path"]})
+    def test_from_dict(self):
+        slot_dict = {"interface": "content", self.key: _ONE_PATH}
         slot_name = "slot-test"
 
         slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
@@ -104,33 +135,25 @@ class ContentSlotTests(unit.TestCase):
 
         self.assertEqual(slot_dict, slot.to_dict())
         self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["read"], slot.read)
-        self.assertEqual(
-            set(slot_dict["read"]), slot.get_content_dirs(installed_path="")
-        )
+        self.assertEqual(_ONE_PATH, getattr(slot, self.key))
+        self.assertEqual(_ONE_PATH_SET, slot.get_content_dirs(installed_path=""))
 
-    def test_read_from_dict_force_source_key(self):
-        slot_dict = OrderedDict({"interface": "content", "read": ["some/path"]})
+    def test_from_dict_force_source_key(self):
+        slot_dict = {"interface": "content", self.key: _ONE_PATH}
         slot_name = "slot-test"
 
         slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
         slot.use_source_key = True
         slot.validate()
-        transformed_dict = slot_dict.copy()
-        transformed_dict["source"] = dict()
-        transformed_dict["source"]["read"] = transformed_dict.pop("read")
+        transformed_dict = {"interface": "content", "source": {self.key: _ONE_PATH}}
 
         self.assertEqual(transformed_dict, slot.to_dict())
         self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["read"], slot.read)
-        self.assertEqual(
-            set(slot_dict["read"]), slot.get_content_dirs(installed_path="")
-        )
+        self.assertEqual(_ONE_PATH, getattr(slot, self.key))
+        self.assertEqual(_ONE_PATH_SET, slot.get_content_dirs(installed_path=""))
 
-    def test_source_read_from_dict(self):
-        slot_dict = OrderedDict(
-            {"interface": "content", "source": {"read": ["some/path"]}}
-        )
+    def test_source_from_dict(self):
+        slot_dict = {"interface": "content", "source": {self.key: _ONE_PATH}}
         slot_name = "slot-test"
 
         slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
@@ -138,85 +161,33 @@ class ContentSlotTests(unit.TestCase):
 
         self.assertEqual(slot_dict, slot.to_dict())
         self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["source"]["read"], slot.read)
-        self.assertEqual(
-            set(slot_dict["source"]["read"]), slot.get_content_dirs(installed_path="")
-        )
+        self.assertEqual(_ONE_PATH, getattr(slot, self.key))
+        self.assertEqual(_ONE_PATH_SET, slot.get_content_dirs(installed_path=""))
 
-    def test_write_from_dict(self):
-        slot_dict = OrderedDict({"interface": "content", "write": ["some/path"]})
-        slot_name = "slot-test"
 
-        slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
-        slot.validate()
-
-        self.assertEqual(slot_dict, slot.to_dict())
-        self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["write"], slot.write)
-        self.assertEqual(
-            set(slot_dict["write"]), slot.get_content_dirs(installed_path="")
-        )
-
-    def test_write_from_dict_force_source_key(self):
-        slot_dict = OrderedDict({"interface": "content", "write": ["some/path"]})
-        slot_name = "slot-test"
-
-        slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
-        slot.use_source_key = True
-        slot.validate()
-        transformed_dict = slot_dict.copy()
-        transformed_dict["source"] = dict()
-        transformed_dict["source"]["write"] = transformed_dict.pop("write")
-
-        self.assertEqual(transformed_dict, slot.to_dict())
-        self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["write"], slot.write)
-        self.assertEqual(
-            set(slot_dict["write"]), slot.get_content_dirs(installed_path="")
-        )
-
-    def test_source_write_from_dict(self):
-        slot_dict = OrderedDict(
-            {"interface": "content", "source": {"write": ["some/path"]}}
-        )
-        slot_name = "slot-test"
-
-        slot = ContentSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
-        slot.validate()
-
-        self.assertEqual(slot_dict, slot.to_dict())
-        self.assertEqual(slot_name, slot.slot_name)
-        self.assertEqual(slot_dict["source"]["write"], slot.write)
-        self.assertEqual(
-            set(slot_dict["source"]["write"]), slot.get_content_dirs(installed_path="")
-        )
-
-
-class DbusSlotTests(unit.TestCase):
+class DbusSlotTests(SlotTestCase):
     def test_invalid_target_raises_exception(self):
         slot = DbusSlot(slot_name="slot-test", bus="", name="")
 
-        self.assertRaises(errors.SlotValidationError, slot.validate)
+        with testtools.ExpectedException(errors.SlotValidationError):
+            slot.validate()
 
     def test_invalid_interface_from_dict_raises_exception(self):
-        slot_dict = OrderedDict({"interface": "content", "bus": "", "name": ""})
+        slot_dict = {"interface": "content", "bus": "", "name": ""}
 
-        self.assertRaises(
-            errors.SlotValidationError,
-            DbusSlot.from_dict,
-            slot_dict=slot_dict,
-            slot_name="slot-test",
-        )
+        with testtools.ExpectedException(errors.SlotValidationError):
+            DbusSlot.from_dict(slot_dict=slot_dict, slot_name="slot-test")
 
     def test_invalid_target_from_dict_raises_exception(self):
-        slot_dict = OrderedDict({"interface": "dbus", "bus": "", "name": ""})
+        slot_dict = {"interface": "dbus", "bus": "", "name": ""}
 
         slot = DbusSlot.from_dict(slot_dict=slot_dict, slot_name="slot-test")
 
-        self.assertRaises(errors.SlotValidationError, slot.validate)
+        with testtools.ExpectedException(errors.SlotValidationError):
+            slot.validate()
 
     def test_basic(self):
-        slot_dict = OrderedDict({"interface": "dbus", "bus": "bus", "name": "name"})
+        slot_dict = {"interface": "dbus", "bus": "bus", "name": "name"}
         slot_name = "slot-test"
 
         slot = DbusSlot(
@@ -230,7 +201,7 @@ class DbusSlotTests(unit.TestCase):
         self.assertEqual(slot_dict["name"], slot.name)
 
     def test_basic_from_dict(self):
-        slot_dict = OrderedDict({"interface": "dbus", "bus": "bus", "name": "name"})
+        slot_dict = {"interface": "dbus", "bus": "bus", "name": "name"}
         slot_name = "slot-test"
 
         slot = DbusSlot.from_dict(slot_dict=slot_dict, slot_name=slot_name)
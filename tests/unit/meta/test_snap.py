@@ -14,59 +14,185 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
+import logging
 import os
+import pathlib
 
+import fixtures
+import testtools
 from collections import OrderedDict
 from snapcraft.internal.meta import errors
 from snapcraft.internal.meta.snap import Snap
-from tests import unit
 from textwrap import dedent
-from unittest import mock
 
 
-class SnapTests(unit.TestCase):
+# The mandatory keys, in the order Snap.to_dict() emits them.
+_BASE_SNAP_DICT = {
+    "name": "snap-test",
+    "version": "snap-version",
+    "summary": "snap-summary",
+    "description": "snap-description",
+}
+
+# Every supported key, in the order Snap.to_dict() emits them.
+_FULL_SNAP_DICT = OrderedDict(
+    {
+        "name": "snap-test",
+        "version": "test-version",
+        "summary": "test-summary",
+        "description": "test-description",
+        "apps": {"test-app": {"command": "test-app"}},
+        "architectures": ["all"],
+        "assumes": ["command-chain"],
+        "base": "core",
+        "confinement": "strict",
+        "environment": {"TESTING": "1"},
+        "epoch": 0,
+        "grade": "devel",
+        "hooks": {"test-hook": {"plugs": ["network"]}},
+        "layout": {"/target": {"bind": "$SNAP/foo"}},
+        "license": "GPL",
+        "plugs": {"test-plug": {"interface": "some-value"}},
+        "slots": {"test-slot": {"interface": "some-value"}},
+        "title": "test-title",
+        "type": "base",
+    }
+)
+
+_SNAP_YAML_FROM_FILE = dedent(
+    """
+    name: test-name
+    version: "1.0"
+    summary: test-summary
+    description: test-description
+    base: core18
+    architectures:
+    - amd64
+    assumes:
+    - snapd2.39
+    confinement: classic
+    grade: devel
+    apps:
+      test-app:
+        command: test-command
+        completer: test-completer
+"""
+)
+
+# Ordering matters for verifying the YAML.
+_SNAP_YAML_TO_FILE = dedent(
+    """
+    name: test-name
+    version: '1.0'
+    summary: test-summary
+    description: test-description
+    apps:
+      test-app:
+        command: test-command
+        completer: test-completer
+    architectures:
+    - amd64
+    assumes:
+    - snapd2.39
+    base: core18
+    confinement: classic
+    grade: devel
+"""
+)
+
+# Installed snap.yaml of the content provider.
+_META_SNAP_YAML = dedent(
+    """
+    name: test-content-snap-meta-snap-yaml
+    version: "1.0"
+    summary: test-summary
+    description: test-description
+    base: core18
+    architectures:
+    - all
+    confinement: strict
+    grade: stable
+    slots:
+      test-slot-name:
+        interface: content
+        source:
+          read:
+          - $SNAP/dir1
+          - $SNAP/dir2
+"""
+)
+
+
+class SnapTests(testtools.TestCase):
     """ Test the snaps.  Note that the ordering of ordereddicts must align
     with Snap's use of _MANDATORY_PACKAGE_KEYS + _OPTIONAL_PACKAGE_KEYS.
 
     This applies even for verifying YAMLs, which are (now) ordered."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # Parse the snap.yaml files once, tests must not modify these snaps.
+        cls.snap_yaml_dir = fixtures.TempDir()
+        cls.snap_yaml_dir.setUp()
+        cls.snap_from_file = cls._load_snap(_SNAP_YAML_FROM_FILE, "from-file.yaml")
+        cls.snap_to_file = cls._load_snap(_SNAP_YAML_TO_FILE, "to-file.yaml")
+
+        cls.full_snap = Snap.from_dict(snap_dict=_FULL_SNAP_DICT)
+        cls.full_snap.validate()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.snap_yaml_dir.cleanUp()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
+        self.path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.FakeLogger(level=logging.ERROR))
+
+    @classmethod
+    def _load_snap(cls, snap_yaml, file_name):
+        snap_yaml_path = os.path.join(cls.snap_yaml_dir.path, file_name)
+        pathlib.Path(snap_yaml_path).write_text(snap_yaml)
+
+        snap = Snap.from_file(snap_yaml_path)
+        snap.validate()
+        return snap
+
     def test_empty(self):
-        snap_dict = OrderedDict({})
+        snap_dict = {}
 
         snap = Snap()
 
-        self.assertEqual(snap_dict, snap.to_dict())
+        self.assertDictEqual(snap_dict, snap.to_dict())
 
     def test_empty_from_dict(self):
-        snap_dict = OrderedDict({})
+        snap_dict = {}
 
         snap = Snap.from_dict(snap_dict=snap_dict)
 
-        self.assertEqual(snap_dict, snap.to_dict())
+        self.assertDictEqual(snap_dict, snap.to_dict())
 
     def test_missing_keys(self):
-        snap_dict = OrderedDict({"name": "snap-test"})
-
-        snap = Snap.from_dict(snap_dict=snap_dict)
+        snap = Snap()
+        snap.name = "snap-test"
 
-        self.assertEqual(snap_dict, snap.to_dict())
-        self.assertRaises(errors.MissingSnapcraftYamlKeysError, snap.validate)
+        self.assertDictEqual({"name": "snap-test"}, snap.to_dict())
+        with testtools.ExpectedException(errors.MissingSnapcraftYamlKeysError):
+            snap.validate()
 
     def test_simple(self):
-        snap_dict = OrderedDict(
-            {
-                "name": "snap-test",
-                "version": "snap-version",
-                "summary": "snap-summary",
-                "description": "snap-description",
-            }
-        )
+        snap_dict = OrderedDict(_BASE_SNAP_DICT)
 
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
 
-        self.assertEqual(snap_dict, snap.to_dict())
-        self.assertEqual(False, snap.is_passthrough_enabled)
+        self.assertDictEqual(snap_dict, snap.to_dict())
+        self.assertFalse(snap.is_passthrough_enabled)
         self.assertEqual(snap_dict["name"], snap.name)
         self.assertEqual(snap_dict["version"], snap.version)
         self.assertEqual(snap_dict["summary"], snap.summary)
@@ -74,74 +200,46 @@ class SnapTests(unit.TestCase):
 
     def test_passthrough(self):
         snap_dict = OrderedDict(
-            {
-                "name": "snap-test",
-                "version": "snap-version",
-                "summary": "snap-summary",
-                "description": "snap-description",
-                "passthrough": {"otherkey": "othervalue"},
-            }
+            {**_BASE_SNAP_DICT, "passthrough": {"otherkey": "othervalue"}}
         )
 
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
 
-        transformed_dict = snap_dict.copy()
-        passthrough = transformed_dict.pop("passthrough")
-        transformed_dict.update(passthrough)
+        transformed_dict = OrderedDict({**_BASE_SNAP_DICT, "otherkey": "othervalue"})
 
-        self.assertEqual(transformed_dict, snap.to_dict())
-        self.assertEqual(True, snap.is_passthrough_enabled)
-        self.assertEqual(passthrough, snap.passthrough)
+        self.assertDictEqual(transformed_dict, snap.to_dict())
+        self.assertTrue(snap.is_passthrough_enabled)
+        self.assertEqual({"otherkey": "othervalue"}, snap.passthrough)
         self.assertEqual(snap_dict["name"], snap.name)
         self.assertEqual(snap_dict["version"], snap.version)
         self.assertEqual(snap_dict["summary"], snap.summary)
         self.assertEqual(snap_dict["description"], snap.description)
 
     def test_all_keys(self):
-        snap_dict = OrderedDict(
-            {
-                "name": "snap-test",
-                "version": "test-version",
-                "summary": "test-summary",
-                "description": "test-description",
-                "apps": {"test-app": {"command": "test-app"}},
-                "architectures": ["all"],
-                "assumes": ["command-chain"],
-                "base": "core",
-                "confinement": "strict",
-                "environment": {"TESTING": "1"},
-                "epoch": 0,
-                "grade": "devel",
-                "hooks": {"test-hook": {"plugs": ["network"]}},
-                "layout": {"/target": {"bind": "$SNAP/foo"}},
-                "license": "GPL",
-                "plugs": {"test-plug": OrderedDict({"interface": "some-value"})},
-                "slots": {"test-slot": OrderedDict({"interface": "some-value"})},
-                "title": "test-title",
-                "type": "base",
-            }
-        )
+        self.assertDictEqual(_FULL_SNAP_DICT, self.full_snap.to_dict())
+        self.assertFalse(self.full_snap.is_passthrough_enabled)
 
-        snap = Snap.from_dict(snap_dict=snap_dict)
-        snap.validate()
+    def test_all_keys_attributes(self):
+        snap = self.full_snap
+        snap_dict = _FULL_SNAP_DICT
 
-        self.assertEqual(snap_dict, snap.to_dict())
-        self.assertEqual(False, snap.is_passthrough_enabled)
         self.assertEqual(snap_dict["name"], snap.name)
         self.assertEqual(snap_dict["version"], snap.version)
         self.assertEqual(snap_dict["summary"], snap.summary)
         self.assertEqual(snap_dict["description"], snap.description)
-        self.assertEqual(snap_dict["apps"]["test-app"], snap.apps["test-app"].to_dict())
+        self.assertDictEqual(
+            snap_dict["apps"]["test-app"], snap.apps["test-app"].to_dict()
+        )
         self.assertEqual(snap_dict["architectures"], snap.architectures)
         self.assertEqual(snap_dict["assumes"], snap.assumes)
         self.assertEqual(snap_dict["base"], snap.base)
         self.assertEqual(snap_dict["environment"], snap.environment)
         self.assertEqual(snap_dict["license"], snap.license)
-        self.assertEqual(
+        self.assertDictEqual(
             snap_dict["plugs"]["test-plug"], snap.plugs["test-plug"].to_dict()
         )
-        self.assertEqual(
+        self.assertDictEqual(
             snap_dict["slots"]["test-slot"], snap.slots["test-slot"].to_dict()
         )
         self.assertEqual(snap_dict["confinement"], snap.confinement)
@@ -151,10 +249,7 @@ class SnapTests(unit.TestCase):
     def test_is_passthrough_enabled_app(self):
         snap_dict = OrderedDict(
             {
-                "name": "snap-test",
-                "version": "test-version",
-                "summary": "test-summary",
-                "description": "test-description",
+                **_BASE_SNAP_DICT,
                 "apps": {
                     "test-app": {
                         "command": "test-app",
@@ -167,15 +262,12 @@ class SnapTests(unit.TestCase):
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
 
-        self.assertEqual(True, snap.is_passthrough_enabled)
+        self.assertTrue(snap.is_passthrough_enabled)
 
     def test_is_passthrough_enabled_hook(self):
         snap_dict = OrderedDict(
             {
-                "name": "snap-test",
-                "version": "test-version",
-                "summary": "test-summary",
-                "description": "test-description",
+                **_BASE_SNAP_DICT,
                 "hooks": {"test-hook": {"passthrough": {"some-key": "some-value"}}},
             }
         )
@@ -183,44 +275,17 @@ class SnapTests(unit.TestCase):
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
 
-        self.assertEqual(True, snap.is_passthrough_enabled)
+        self.assertTrue(snap.is_passthrough_enabled)
 
     def test_from_file(self):
-        snap_yaml = dedent(
-            """
-            name: test-name
-            version: "1.0"
-            summary: test-summary
-            description: test-description
-            base: core18
-            architectures:
-            - amd64
-            assumes:
-            - snapd2.39
-            confinement: classic
-            grade: devel
-            apps:
-              test-app:
-                command: test-command
-                completer: test-completer
-        """
-        )
-
-        meta_path = os.path.join(self.path, "meta")
-        os.makedirs(meta_path)
-
-        snap_yaml_path = os.path.join(self.path, "meta", "snap.yaml")
-        open(snap_yaml_path, "w").write(snap_yaml)
-
-        snap = Snap.from_file(snap_yaml_path)
-        snap.validate()
+        snap = self.snap_from_file
 
         self.assertEqual("test-name", snap.name)
         self.assertEqual("1.0", snap.version)
         self.assertEqual("test-summary", snap.summary)
         self.assertEqual("test-description", snap.description)
         self.assertEqual(
-            OrderedDict({"command": "test-command", "completer": "test-completer"}),
+            {"command": "test-command", "completer": "test-completer"},
             snap.apps["test-app"].to_dict(),
         )
         self.assertEqual(["amd64"], snap.architectures)
@@ -230,44 +295,18 @@ class SnapTests(unit.TestCase):
         self.assertEqual("devel", snap.grade)
 
     def test_to_file(self):
-        # Ordering matters for verifying the YAML.
-        snap_yaml = dedent(
-            """
-            name: test-name
-            version: '1.0'
-            summary: test-summary
-            description: test-description
-            apps:
-              test-app:
-                command: test-command
-                completer: test-completer
-            architectures:
-            - amd64
-            assumes:
-            - snapd2.39
-            base: core18
-            confinement: classic
-            grade: devel
-        """
-        )
-
-        meta_path = os.path.join(self.path, "meta")
-        os.makedirs(meta_path)
-
-        snap_yaml_path = os.path.join(self.path, "meta", "snap.yaml")
-        open(snap_yaml_path, "w").write(snap_yaml)
-
-        snap = Snap.from_file(snap_yaml_path)
-        snap.validate()
+        # Writing may update the snap, do not leak that into other tests.
+        snap = copy.deepcopy(self.snap_to_file)
 
         # Write snap yaml.
+        snap_yaml_path = os.path.join(self.path, "snap.yaml")
         snap.write_snap_yaml(path=snap_yaml_path)
 
         # Read snap yaml.
-        written_snap_yaml = open(snap_yaml_path, "r").read()
+        written_snap_yaml = pathlib.Path(snap_yaml_path).read_text()
 
         # Compare stripped versions (to remove leading/trailing newlines).
-        self.assertEqual(snap_yaml.strip(), written_snap_yaml.strip())
+        self.assertEqual(_SNAP_YAML_TO_FILE.strip(), written_snap_yaml.strip())
 
     def test_get_provider_content_directories_no_plugs(self):
         snap = Snap()
@@ -291,40 +330,19 @@ class SnapTests(unit.TestCase):
             }
         )
 
-        meta_snap_yaml = dedent(
-            """
-            name: test-content-snap-meta-snap-yaml
-            version: "1.0"
-            summary: test-summary
-            description: test-description
-            base: core18
-            architectures:
-            - all
-            confinement: strict
-            grade: stable
-            slots:
-              test-slot-name:
-                interface: content
-                source:
-                  read:
-                  - $SNAP/dir1
-                  - $SNAP/dir2
-        """
-        )
-
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
 
-        patcher = mock.patch("snapcraft.internal.common.get_installed_snap_path")
-        mock_core_path = patcher.start()
-        mock_core_path.return_value = self.path
-        self.addCleanup(patcher.stop)
-
-        meta_path = os.path.join(self.path, "meta")
-        os.makedirs(meta_path)
+        self.useFixture(
+            fixtures.MonkeyPatch(
+                "snapcraft.internal.common.get_installed_snap_path",
+                lambda snap_name: self.path,
+            )
+        )
 
-        snap_yaml_path = os.path.join(meta_path, "snap.yaml")
-        open(snap_yaml_path, "w").write(meta_snap_yaml)
+        meta_path = pathlib.Path(self.path, "meta")
+        meta_path.mkdir(parents=True)
+        (meta_path / "snap.yaml").write_text(_META_SNAP_YAML)
 
         expected_content_dirs = set(
             [os.path.join(self.path, "dir1"), os.path.join(self.path, "dir2")]
@@ -335,10 +353,7 @@ class SnapTests(unit.TestCase):
     def test_ensure_command_chain_assumption(self):
         snap_dict = OrderedDict(
             {
-                "name": "snap-test",
-                "version": "snap-version",
-                "summary": "snap-summary",
-                "description": "snap-description",
+                **_BASE_SNAP_DICT,
                 "apps": {
                     "test-app": {
                         "command": "test-app",
@@ -352,18 +367,10 @@ class SnapTests(unit.TestCase):
         snap._ensure_command_chain_assumption()
         snap.validate()
 
-        self.assertEqual({"command-chain"}, snap.assumes)
+        self.assertSetEqual({"command-chain"}, snap.assumes)
 
     def test_write_snap_yaml_skips_base_core(self):
-        snap_dict = OrderedDict(
-            {
-                "name": "snap-test",
-                "version": "snap-version",
-                "summary": "snap-summary",
-                "description": "snap-description",
-                "base": "core",
-            }
-        )
+        snap_dict = OrderedDict({**_BASE_SNAP_DICT, "base": "core"})
 
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
@@ -373,21 +380,13 @@ class SnapTests(unit.TestCase):
         snap.write_snap_yaml(path=snap_yaml_path)
 
         # Read snap yaml.
-        written_snap_yaml = open(snap_yaml_path, "r").read()
+        written_snap_yaml = pathlib.Path(snap_yaml_path).read_text()
 
-        self.assertEqual(snap_dict, snap.to_dict())
+        self.assertDictEqual(snap_dict, snap.to_dict())
         self.assertFalse("base" in written_snap_yaml)
 
     def test_write_snap_yaml_with_base_core18(self):
-        snap_dict = OrderedDict(
-            {
-                "name": "snap-test",
-                "version": "snap-version",
-                "summary": "snap-summary",
-                "description": "snap-description",
-                "base": "core18",
-            }
-        )
+        snap_dict = OrderedDict({**_BASE_SNAP_DICT, "base": "core18"})
 
         snap = Snap.from_dict(snap_dict=snap_dict)
         snap.validate()
@@ -397,7 +396,7 @@ class SnapTests(unit.TestCase):
         snap.write_snap_yaml(path=snap_yaml_path)
 
         # Read snap yaml.
-        written_snap_yaml = open(snap_yaml_path, "r").read()
+        written_snap_yaml = pathlib.Path(snap_yaml_path).read_text()
 
-        self.assertEqual(snap_dict, snap.to_dict())
+        self.assertDictEqual(snap_dict, snap.to_dict())
         self.assertTrue("base" in written_snap_yaml)
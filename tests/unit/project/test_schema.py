@@ -21,7 +21,7 @@ from testscenarios.scenarios import multiply_scenarios
 from testtools.matchers import Contains, Equals, MatchesAny, MatchesRegex
 
 from . import ProjectBaseTest
-from snapcraft.project import errors
+from snapcraft.project import _schema, errors
 from snapcraft.project._schema import Validator
 from tests import unit
 
@@ -76,6 +76,7 @@ class ValidationTest(ValidationBaseTest):
         self.assertThat(raised.message, Equals(expected_message), message=self.data)
 
     def test_schema_file_not_found(self):
+        _schema._load_schema_file.cache_clear()
         mock_the_open = mock.mock_open()
         mock_the_open.side_effect = FileNotFoundError()
 
@@ -85,6 +86,19 @@ class ValidationTest(ValidationBaseTest):
         expected_message = "snapcraft validation file is missing from installation path"
         self.assertThat(raised.message, Equals(expected_message))
 
+    def test_schema_is_checked_once(self):
+        _schema._get_schema_validator.cache_clear()
+        self.addCleanup(_schema._get_schema_validator.cache_clear)
+
+        with mock.patch(
+            "jsonschema.validators.validator_for",
+            wraps=_schema.jsonschema.validators.validator_for,
+        ) as validator_for_mock:
+            Validator(self.data).validate()
+            Validator(self.data).validate()
+
+        validator_for_mock.assert_called_once_with(mock.ANY)
+
     def test_icon_missing_is_valid_yaml(self):
         self.mock_path_exists.return_value = False
 
@@ -883,3 +883,19 @@ class SnapcraftExceptionTests(unit.TestCase):
         self.assertEquals(self.expected_resolution, exception.get_resolution())
         self.assertEquals(self.expected_details, exception.get_details())
         self.assertEquals(self.expected_docs_url, exception.get_docs_url())
+
+
+class SnapcraftErrorTests(unit.TestCase):
+    def test_message_is_rendered_once(self):
+        exception = errors.SnapcraftPartConflictError(
+            part_name="part", other_part_name="other-part", conflict_files=["b", "a"]
+        )
+
+        with mock.patch.object(
+            errors.SnapcraftPartConflictError,
+            "_get_fmt_fields",
+            wraps=exception._get_fmt_fields,
+        ) as get_fmt_fields_mock:
+            self.assertThat(str(exception), Equals(str(exception)))
+
+        get_fmt_fields_mock.assert_called_once_with()
@@ -14,9 +14,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import collections
 import io
 
-from testtools.matchers import Equals
+from testtools.matchers import Equals, IsInstance
 
 from snapcraft import yaml_utils
 from tests import unit
@@ -29,3 +30,29 @@ class OctIntTest(unit.TestCase):
         output.seek(0)
 
         self.assertThat(output.read().strip(), Equals("number: 0010"))
+
+
+class LoadDumpTest(unit.TestCase):
+    def test_octint_round_trip(self):
+        dumped = yaml_utils.dump(dict(mode=yaml_utils.OctInt(0o755)))
+
+        self.assertThat(yaml_utils.load(io.StringIO(dumped)), Equals(dict(mode=0o755)))
+
+    def test_load_keeps_mapping_order(self):
+        loaded = yaml_utils.load(io.StringIO("b: 1\na: 2\nc: 3\n"))
+
+        self.expectThat(loaded, IsInstance(collections.OrderedDict))
+        self.expectThat(list(loaded), Equals(["b", "a", "c"]))
+
+    def test_load_merge_keys(self):
+        loaded = yaml_utils.load(
+            io.StringIO("base: &base\n  a: 1\nderived:\n  <<: *base\n  b: 2\n")
+        )
+
+        self.assertThat(loaded["derived"], Equals(dict(a=1, b=2)))
+
+    def test_dump_multiline_string_as_literal_block(self):
+        self.assertThat(
+            yaml_utils.dump(dict(text="line one\nline two")),
+            Equals("text: |-\n  line one\n  line two\n"),
+        )